@@ -1,4 +1,8 @@
+import collections
+import mmap
 import os
+import stat
+import threading
 
 try:
     import pygame
@@ -9,22 +13,74 @@ except Exception:
 import winsound  # fallback for wav if pygame not available
 
 _pygame_inited = False
-_sound_cache = {}      # file_path -> pygame Sound
-_channel_by_btn = {}   # "BTN1" -> pygame Channel (fixed channel per button)
+_sound_cache = collections.OrderedDict()  # file_path -> pygame Sound (LRU order)
+_sound_cache_bytes = 0                    # estimated decoded size of cached sounds
+_btn_channels = []     # index i -> pygame Channel for "BTN{i+1}" (grown on demand)
+_extra_channels = {}   # non-"BTN<n>" ids -> pygame Channel (rare)
+_btn_index_cache = {}  # btn_id string -> parsed channel index (or None)
+_norm_path_cache = {}  # path as given -> normalized path
+_identity_cache = {}   # normalized path -> sound-cache key ((dev, ino) or path)
+_path_ok_cache = {}    # file_path -> bool (avoids re-stat()ing on every press)
+_ext_cache = {}        # file_path -> lowercased extension (winsound fallback only)
+
+# Stop-mode flags. Callers should resolve the config's "SAME"/"ANY"
+# string to one of these ints once (when the mode changes), so the per-
+# press comparison in play_audio is an int compare, not a string compare.
+STOP_SAME = 0
+STOP_ANY = 1
 
 # Give ourselves plenty of mixer channels so overlap is reliable even when
 # buttons are spammed rapidly (fast retrigger) or many buttons exist.
 _DEFAULT_NUM_CHANNELS = 64
 
+# Output buffer size in sample frames; smaller = lower trigger-to-sound
+# latency, larger = more resilient to underruns. Overridable via config.
+_DEFAULT_MIXER_BUFFER = 512
+
+# The low channels are dedicated to buttons (BTN1 -> 0, BTN2 -> 1, ...).
+# Reserving them keeps pygame's automatic channel picker (anything played
+# without an explicit channel) from ever grabbing and cutting off a
+# button's channel. 32 matches the GUI's maximum button count.
+_RESERVED_FOR_BUTTONS = 32
+
+# Cap on the decoded PCM held in _sound_cache. 256 MiB is ~25 minutes of
+# 44.1 kHz 16-bit stereo -- far more than a soundboard of short clips
+# needs, but it stops pathological mappings (huge files, many remaps)
+# from growing memory without bound.
+_SOUND_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Mixer init happens on a background thread at import (see module bottom)
+# so the first button press doesn't stall on pygame.mixer.init().
+_mixer_ready = threading.Event()
+_init_lock = threading.Lock()
+
 
 def _init_pygame():
     """
-    Initialize pygame mixer exactly once.
+    Initialize pygame mixer exactly once (thread-safe).
     Also pre-allocate a healthy channel pool so pygame doesn't steal channels
     during rapid re-triggers / overlap scenarios.
     """
     global _pygame_inited
-    if _PYGAME_OK and not _pygame_inited:
+    if not _PYGAME_OK or _pygame_inited:
+        return
+
+    with _init_lock:
+        if _pygame_inited:
+            return
+
+        # Ask SDL for a small output buffer up front; the default config on
+        # Windows (22050 Hz, large buffer) adds tens of ms between trigger
+        # and DAC. Latency is roughly buffer / frequency seconds, so
+        # 512 / 44100 ~= 12 ms. The buffer size is tunable via config
+        # ("mixer_buffer") for machines that crackle at 512.
+        try:
+            from config_manager import load_config
+            buffer = int(load_config().get("mixer_buffer", _DEFAULT_MIXER_BUFFER))
+        except Exception:
+            buffer = _DEFAULT_MIXER_BUFFER
+
+        pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=buffer)
         pygame.mixer.init()
 
         # IMPORTANT:
@@ -33,7 +89,9 @@ def _init_pygame():
         # instead of overlapping. We fix this by pre-allocating a lot of
         # channels and assigning a dedicated Channel per button.
         pygame.mixer.set_num_channels(_DEFAULT_NUM_CHANNELS)
+        pygame.mixer.set_reserved(_RESERVED_FOR_BUTTONS)
         _pygame_inited = True
+        _mixer_ready.set()
 
 
 def _ensure_min_channels(min_channels: int) -> None:
@@ -45,6 +103,9 @@ def _ensure_min_channels(min_channels: int) -> None:
         current = pygame.mixer.get_num_channels()
         if current < min_channels:
             pygame.mixer.set_num_channels(max(min_channels, _DEFAULT_NUM_CHANNELS))
+            # set_num_channels resets the reserved set; keep button channels
+            # protected from automatic channel picking.
+            pygame.mixer.set_reserved(max(min_channels, _RESERVED_FOR_BUTTONS))
     except Exception:
         # Fail soft if something is odd in a specific environment.
         pass
@@ -54,34 +115,224 @@ def _get_fixed_channel_for_button(btn_id: str):
     """
     Return a dedicated pygame Channel for the given button id.
 
-    Deterministic mapping:
+    Deterministic mapping kept as a flat list (button number = index):
       BTN1 -> channel 0
       BTN2 -> channel 1
       ...
+    Unexpected ids get slots above the reserved button block.
     """
-    if btn_id in _channel_by_btn:
-        return _channel_by_btn[btn_id]
+    # Parse "BTN<number>" once per distinct id; repeat presses hit the memo.
+    try:
+        idx = _btn_index_cache[btn_id]
+    except KeyError:
+        idx = None
+        try:
+            if btn_id.upper().startswith("BTN"):
+                idx = int(btn_id[3:]) - 1
+                if idx < 0:
+                    idx = None
+        except Exception:
+            idx = None
+        _btn_index_cache[btn_id] = idx
+
+    if idx is not None:
+        if idx < len(_btn_channels) and _btn_channels[idx] is not None:
+            return _btn_channels[idx]
+        _ensure_min_channels(idx + 1)
+        while len(_btn_channels) <= idx:
+            _btn_channels.append(None)
+        ch = _btn_channels[idx] = pygame.mixer.Channel(idx)
+        return ch
+
+    # Fallback for unexpected ids: allocate slots past the button block so
+    # they never collide with a real button's channel.
+    ch = _extra_channels.get(btn_id)
+    if ch is None:
+        slot = _RESERVED_FOR_BUTTONS + len(_extra_channels)
+        _ensure_min_channels(slot + 1)
+        ch = _extra_channels[btn_id] = pygame.mixer.Channel(slot)
+    return ch
 
-    idx = None
 
-    # Try to parse "BTN<number>"
+def _check_file(file_path: str) -> bool:
+    """
+    Cached playability check. A single os.stat covers both existence and
+    is-a-regular-file (os.path.isfile would stat too, but via an extra
+    layer and without letting us cache the outcome in one place).
+    """
+    ok = _path_ok_cache.get(file_path)
+    if ok is None:
+        if not file_path:
+            ok = False
+        else:
+            try:
+                ok = stat.S_ISREG(os.stat(file_path).st_mode)
+            except OSError:
+                ok = False
+        _path_ok_cache[file_path] = ok
+    return ok
+
+
+def _prefetch_file(file_path: str) -> None:
+    """
+    Hint the OS to start reading the file into the page cache so the
+    decode that follows hits warm pages. posix_fadvise(WILLNEED) is
+    async and nearly free; on platforms without it (Windows) this is a
+    no-op -- the decode itself warms the cache there.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _sound_size_estimate(sound) -> int:
+    """Estimated decoded size in bytes (mixer format: 44.1 kHz s16 stereo)."""
     try:
-        if btn_id.upper().startswith("BTN"):
-            idx = int(btn_id[3:]) - 1
-            if idx < 0:
-                idx = None
+        return int(sound.get_length() * 44100 * 2 * 2)
     except Exception:
-        idx = None
+        return 0
 
-    # Fallback for unexpected ids: allocate next available slot.
-    if idx is None:
-        idx = len(_channel_by_btn)
 
-    _ensure_min_channels(idx + 1)
+def _load_sound(file_path: str):
+    """
+    Decode a file into a pygame Sound.
 
-    ch = pygame.mixer.Channel(idx)
-    _channel_by_btn[btn_id] = ch
-    return ch
+    WAV files are fed to pygame through a read-only mmap: the kernel pages
+    the file straight into the decode instead of Python first slurping it
+    into an intermediate bytes object, which halves the transient memory
+    spike for big files.
+    """
+    if file_path.lower().endswith(".wav"):
+        try:
+            with open(file_path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    # mmap supports read/seek, so pygame treats it as a file.
+                    return pygame.mixer.Sound(file=mm)
+                finally:
+                    mm.close()
+        except (OSError, ValueError):
+            pass  # empty/locked file etc. -- let the normal path report it
+    return pygame.mixer.Sound(file_path)
+
+
+def _norm_key(file_path: str) -> str:
+    """
+    Normalized path so the same file mapped to several buttons (or
+    spelled with different case / relative segments) shares one decoded
+    Sound instead of N copies.
+    """
+    key = _norm_path_cache.get(file_path)
+    if key is None:
+        key = _norm_path_cache[file_path] = os.path.normcase(os.path.abspath(file_path))
+    return key
+
+
+def _file_identity(norm_path: str):
+    """
+    Sound-cache key identifying the file's CONTENT: (device, inode) when
+    the OS reports one, so copies reached through hard links or duplicate
+    mount spellings still share a single decoded Sound. Falls back to the
+    normalized path where inodes aren't available. Memoized per path;
+    cleared together with the path cache on config changes.
+    """
+    key = _identity_cache.get(norm_path)
+    if key is None:
+        key = norm_path
+        try:
+            st = os.stat(norm_path)
+            if st.st_ino:
+                key = (st.st_dev, st.st_ino)
+        except OSError:
+            pass
+        _identity_cache[norm_path] = key
+    return key
+
+
+def _get_sound(file_path: str):
+    """
+    Fetch (or decode and cache) the Sound for a path, keeping the cache
+    in LRU order and bounded by _SOUND_CACHE_MAX_BYTES.
+    """
+    global _sound_cache_bytes
+
+    file_path = _norm_key(file_path)
+    key = _file_identity(file_path)
+    sound = _sound_cache.get(key)
+    if sound is not None:
+        _sound_cache.move_to_end(key)
+        return sound
+
+    sound = _load_sound(file_path)
+    _sound_cache[key] = sound
+    _sound_cache_bytes += _sound_size_estimate(sound)
+
+    # Evict least-recently-played entries if the budget is blown. Evicted
+    # Sounds that are still playing keep their buffer alive until done.
+    while _sound_cache_bytes > _SOUND_CACHE_MAX_BYTES and len(_sound_cache) > 1:
+        _, evicted = _sound_cache.popitem(last=False)
+        _sound_cache_bytes -= _sound_size_estimate(evicted)
+
+    return sound
+
+
+def preload_sounds(audio_folder: str, button_files: dict) -> None:
+    """
+    Decode every mapped audio file up front so the FIRST press of each
+    button is as fast as a repeat press (dict lookup + Channel.play),
+    instead of paying full WAV/MP3 decode latency.
+
+    Note: pygame.mixer.Sound objects hold the fully decoded raw PCM,
+    already converted to the mixer's output format. Playback is therefore
+    a straight memory copy into the mix -- there is no per-play decode or
+    resample left to optimize away.
+
+    Safe to call again after remaps; already-cached files are skipped.
+    The lazy path in play_audio stays as a fallback for late remaps.
+    """
+    if not _PYGAME_OK:
+        return
+
+    # Decode AFTER the mixer is up so SDL converts each file to the output
+    # format once, here, rather than lazily at first play.
+    _init_pygame()
+
+    to_load = []
+    for btn_id, name in (button_files or {}).items():
+        if not name:
+            continue
+        file_path = name if os.path.isabs(name) else os.path.join(audio_folder, name)
+        if (_file_identity(_norm_key(file_path)) not in _sound_cache
+                and _check_file(file_path)):
+            to_load.append(file_path)
+
+    # Kick off readahead for every file first, then decode: the OS pulls
+    # file N+1 off disk while we're still decoding file N.
+    for file_path in to_load:
+        _prefetch_file(file_path)
+
+    for file_path in to_load:
+        try:
+            _get_sound(file_path)
+        except Exception as e:
+            print(f"[AUDIO] Could not preload {file_path}: {e}")
+
+
+def invalidate_path_cache() -> None:
+    """
+    Forget cached file-existence checks and content identities.
+    Call this whenever mappings / the audio folder change so renamed,
+    replaced or deleted files are re-checked on the next press.
+    """
+    _path_ok_cache.clear()
+    _identity_cache.clear()
 
 
 def stop_all_audio() -> None:
@@ -91,45 +342,53 @@ def stop_all_audio() -> None:
         # Keep the channel mapping; we reuse fixed channels per button.
 
 
-def play_audio(btn_id: str, file_path: str, stop_mode: str = "SAME") -> None:
+def play_audio(btn_id: str, file_path: str, stop_mode: int = STOP_SAME) -> None:
     """
     stop_mode:
-      - "ANY": stop ALL audio whenever any button plays
-      - "SAME": stop only the previous audio from the same btn_id
-               (overlap across different buttons stays intact)
+      - STOP_ANY: stop ALL audio whenever any button plays
+      - STOP_SAME: stop only the previous audio from the same btn_id
+                   (overlap across different buttons stays intact)
+    The legacy "ANY"/"SAME" strings are still accepted.
     """
     try:
-        if not file_path or not os.path.isfile(file_path):
+        # Cached stat(); button mashing would otherwise re-check the same
+        # file on every single press.
+        if not _check_file(file_path):
             print(f"[AUDIO] File not found: {file_path}")
             return
 
         # pygame path (multi-format + overlap control)
         if _PYGAME_OK:
-            _init_pygame()
+            if not _mixer_ready.is_set():
+                # Import-time init may still be running; give it a moment,
+                # then fall through to _init_pygame which is a no-op if the
+                # background thread already finished.
+                _mixer_ready.wait(timeout=2.0)
+                _init_pygame()
 
             # Cache decoded audio so repeat triggers are instant.
-            if file_path not in _sound_cache:
-                _sound_cache[file_path] = pygame.mixer.Sound(file_path)
-
-            sound = _sound_cache[file_path]
+            sound = _get_sound(file_path)
 
             # Dedicated channel per button = no channel stealing across buttons.
             ch = _get_fixed_channel_for_button(btn_id)
 
-            if stop_mode == "ANY":
+            if stop_mode == STOP_ANY or stop_mode == "ANY":
                 # Stop everything, then play on this button's fixed channel.
                 stop_all_audio()
                 ch.play(sound)
                 return
 
-            # stop_mode == "SAME"
+            # STOP_SAME
             # Fast retrigger behavior: stop only THIS button's channel, then replay.
             ch.stop()
             ch.play(sound)
             return
 
-        # winsound fallback (wav only)
-        ext = os.path.splitext(file_path)[1].lower()
+        # winsound fallback (wav only).
+        # splitext + lower() allocate on every call; do it once per path.
+        ext = _ext_cache.get(file_path)
+        if ext is None:
+            ext = _ext_cache[file_path] = os.path.splitext(file_path)[1].lower()
         if ext == ".wav":
             winsound.PlaySound(file_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
         else:
@@ -137,3 +396,10 @@ def play_audio(btn_id: str, file_path: str, stop_mode: str = "SAME") -> None:
 
     except Exception as e:
         print(f"[AUDIO ERROR] {e}")
+
+
+# Kick off mixer initialization in the background as soon as the module is
+# imported, so the (potentially slow) audio-device setup overlaps with GUI
+# startup instead of delaying the first button press.
+if _PYGAME_OK:
+    threading.Thread(target=_init_pygame, daemon=True).start()
@@ -8,14 +8,25 @@ Handles saving/loading configuration such as:
 - stop mode (SAME vs ANY)
 """
 
+import functools
 import json
 import os
 import sys
 
+try:
+    # orjson serializes/parses several times faster than the stdlib; the
+    # config is written on every mapping change, so this keeps GUI
+    # interactions snappy. Optional -- stdlib json is the fallback.
+    import orjson
+    _ORJSON_OK = True
+except ImportError:
+    _ORJSON_OK = False
+
 # Name of the config file that will live next to the .exe / script
 CONFIG_FILENAME = "config.json"
 
 
+@functools.lru_cache(maxsize=1)
 def get_app_dir():
     """
     Returns the directory where the script or .exe is located.
@@ -29,6 +40,7 @@ def get_app_dir():
         return os.path.dirname(os.path.abspath(__file__))
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_path():
     """
     Returns the full path to the config.json file.
@@ -49,22 +61,26 @@ def load_config():
         "button_files": {},          # key: "BTN1", value: "filename.wav"
         "last_port": "",
         "toggle_button_id": "",      # e.g. "BTN10" or "" (disabled)
-        "stop_mode": "SAME"          # "SAME" or "ANY"
+        "stop_mode": "SAME",         # "SAME" or "ANY"
+        "mixer_buffer": 512          # audio output buffer (frames); lower = less latency
     }
 
     if not os.path.isfile(path):
         return default_config
 
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if _ORJSON_OK:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
     except Exception:
         return default_config
 
     # Ensure required keys exist (migrate older configs)
     for k, v in default_config.items():
-        if k not in data:
-            data[k] = v
+        data.setdefault(k, v)
 
     # Validate stop_mode
     if data.get("stop_mode") not in ("SAME", "ANY"):
@@ -80,10 +96,24 @@ def load_config():
 def save_config(config):
     """
     Saves the configuration dictionary to disk.
+
+    Writes to a temp file in the same directory and swaps it into place
+    with os.replace, so a crash mid-write can never leave a truncated
+    config.json and concurrent readers always see a complete file.
     """
     path = get_config_path()
+    tmp_path = path + ".tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4)
+        if _ORJSON_OK:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=4)
+        os.replace(tmp_path, path)
     except Exception as e:
         print(f"Failed to save config: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
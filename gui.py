@@ -10,8 +10,13 @@ The GUI does NOT talk directly to serial or audio; it calls callbacks supplied
 by main.py so things stay modular.
 """
 
+import collections
+import copy
+import functools
 import os
 import sys
+import threading
+import time
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -19,11 +24,27 @@ from tkinter import ttk, filedialog, messagebox
 from config_manager import load_config, save_config
 from version import APP_NAME, APP_VERSION
 
-try:
-    # Import only for listing ports in the GUI
-    from serial.tools import list_ports
-except ImportError:
-    list_ports = None
+# serial.tools.list_ports is imported lazily on the first refresh (it
+# drags in pyserial's device-enumeration machinery, which is dead weight
+# during window construction). False = not tried yet, None = unavailable.
+_list_ports = False
+
+
+def _get_list_ports():
+    global _list_ports
+    if _list_ports is False:
+        try:
+            from serial.tools import list_ports
+            _list_ports = list_ports
+        except ImportError:
+            _list_ports = None
+    return _list_ports
+
+# Startup constants, built once at import instead of per-widget/per-call.
+MAX_BUTTONS = 32
+TOGGLE_OPTIONS = [""] + [f"BTN{i}" for i in range(1, MAX_BUTTONS + 1)]
+# Tuple so it can feed str.endswith directly (single C call per name).
+AUDIO_EXTS = (".wav", ".mp3", ".ogg", ".flac", ".m4a", ".aac", ".wma")
 
 
 class App(tk.Tk):
@@ -71,8 +92,40 @@ class App(tk.Tk):
         self.stop_mode_var = tk.StringVar(value=self.config_data.get("stop_mode", "SAME"))
         self.toggle_btn_var = tk.StringVar(value=self.config_data.get("toggle_button_id", ""))
 
-        # Will hold Tkinter StringVars for each button's selected file
+        # Will hold Tkinter StringVars for each button's selected file,
+        # plus direct references to each row's combobox so populating the
+        # dropdowns never has to search the widget tree.
         self.button_file_vars = {}
+        self.button_combos = {}
+
+        # Last file list pushed into each combobox, so populate only does
+        # the Tcl configure round-trip when the values really changed.
+        self._combo_values = {}
+        self._populate_idle_pending = False
+
+        # Row frames in button order; rows are added/removed from the end
+        # rather than rebuilding the whole section on every count change.
+        self._button_rows = []
+
+        # Cached audio-folder listing: (folder, folder mtime, files).
+        # Re-listing is skipped while the directory mtime is unchanged.
+        self._file_list_cache = None
+
+        # Cached COM-port enumeration: (timestamp, comports() result).
+        # Enumeration can take hundreds of ms on Windows, so repeated
+        # Refresh clicks within the TTL reuse the last result.
+        self._ports_cache = None
+        self._ports_cache_ttl = 2.0
+
+        # Incoming serial lines awaiting a log flush. Bounded so a chatty
+        # Arduino can't grow memory; old lines are dropped, not the app.
+        self._serial_log = collections.deque(maxlen=200)
+        self._log_flush_scheduled = False
+
+        # Pending after() id for the debounced config save, plus a snapshot
+        # of what was last written so unchanged configs skip the disk.
+        self._save_after_id = None
+        self._last_saved_config = copy.deepcopy(self.config_data)
 
         # GUI sections
         self._create_folder_section()
@@ -86,7 +139,6 @@ class App(tk.Tk):
 
         # Initially build the button rows
         self._rebuild_button_rows()
-        self._schedule_auto_refresh_files()
 
         # Apply stored button file mappings from config
         self._apply_stored_mappings()
@@ -119,8 +171,9 @@ class App(tk.Tk):
 
         # Save to config
         self.config_data["audio_folder"] = self.audio_folder
-        save_config(self.config_data)
+        self._save_config_if_changed()
 
+        self._populate_all_combos()
         self._notify_mappings_changed()
 
     # -------------------------------------------------------------------------
@@ -135,17 +188,20 @@ class App(tk.Tk):
         self.port_combo = ttk.Combobox(frame, state="readonly", width=30)
         self.port_combo.pack(side="left", padx=5, pady=5)
 
+        # Device names parallel to the combobox entries; the selected
+        # device is _port_devices[combo.current()].
+        self._port_devices = []
+
         refresh_btn = ttk.Button(frame, text="Refresh", command=self._refresh_ports)
         refresh_btn.pack(side="left", padx=5, pady=5)
 
         # NEW: Toggle button selection
         ttk.Label(frame, text="Toggle BTN:").pack(side="left", padx=(15, 2), pady=5)
-        toggle_options = [""] + [f"BTN{i}" for i in range(1, 33)]
         self.toggle_combo = ttk.Combobox(frame, state="readonly", width=7,
                                          textvariable=self.toggle_btn_var,
-                                         values=toggle_options)
+                                         values=TOGGLE_OPTIONS)
         self.toggle_combo.pack(side="left", padx=5, pady=5)
-        self.toggle_combo.bind("<<ComboboxSelected>>", lambda e: self._save_toggle_settings())
+        self.toggle_combo.bind("<<ComboboxSelected>>", self._on_toggle_selected)
 
         # NEW: Stop mode display (read-only label)
         self.mode_label_var = tk.StringVar(value=self._mode_label_text(self.stop_mode_var.get()))
@@ -159,6 +215,9 @@ class App(tk.Tk):
         # Ensure UI reflects loaded config
         self._save_toggle_settings(save_only=True)
 
+    def _on_toggle_selected(self, event=None):
+        self._save_toggle_settings()
+
     def _mode_label_text(self, mode: str) -> str:
         if mode == "ANY":
             return "Mode: ANY (stop all)"
@@ -168,12 +227,16 @@ class App(tk.Tk):
         """
         Save toggle button + stop mode to config.
         """
-        self.config_data["toggle_button_id"] = self.toggle_btn_var.get().strip()
-        self.config_data["stop_mode"] = self.stop_mode_var.get().strip() or "SAME"
-        save_config(self.config_data)
+        # Read each Tk variable once; every .get() is a Tcl round-trip.
+        toggle_btn = self.toggle_btn_var.get().strip()
+        stop_mode = self.stop_mode_var.get().strip() or "SAME"
+
+        self.config_data["toggle_button_id"] = toggle_btn
+        self.config_data["stop_mode"] = stop_mode
+        self._save_config_if_changed()
 
         # Keep label updated
-        self.mode_label_var.set(self._mode_label_text(self.stop_mode_var.get()))
+        self.mode_label_var.set(self._mode_label_text(stop_mode))
 
         # Optionally notify main that settings changed
         if not save_only and self._on_update_mappings:
@@ -197,31 +260,45 @@ class App(tk.Tk):
         return mode if mode in ("SAME", "ANY") else "SAME"
 
     def _refresh_ports(self, select_port=None):
+        """
+        Refresh the port dropdown. The (lazy) pyserial import and the
+        enumeration both run on a worker thread -- enumeration can block
+        for hundreds of ms on Windows -- and the result is applied back
+        on the Tk thread via after(). A recent cached enumeration is
+        applied synchronously instead.
+        """
+        if self._ports_cache is not None:
+            ts, ports = self._ports_cache
+            if time.monotonic() - ts < self._ports_cache_ttl:
+                self._apply_ports(ports, select_port)
+                return
+
+        def worker():
+            lp = _get_list_ports()
+            ports = lp.comports() if lp is not None else []
+            self._ports_cache = (time.monotonic(), ports)
+            self.after(0, self._apply_ports, ports, select_port)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _apply_ports(self, ports, select_port=None):
         ports_display = []
         ports_values = []
+        for p in ports:
+            ports_display.append(f"{p.device} - {p.description}")
+            ports_values.append(p.device)
 
-        if list_ports is None:
-            self.port_combo["values"] = []
-        else:
-            for p in list_ports.comports():
-                display = f"{p.device} - {p.description}"
-                ports_display.append(display)
-                ports_values.append(p.device)
-
-        self.port_display_to_value = dict(zip(ports_display, ports_values))
+        self._port_devices = ports_values
         self.port_combo["values"] = ports_display
 
-        if select_port:
-            for display, value in self.port_display_to_value.items():
-                if value == select_port:
-                    self.port_combo.set(display)
-                    break
+        if select_port and select_port in ports_values:
+            self.port_combo.current(ports_values.index(select_port))
 
     def get_selected_port(self):
-        display = self.port_combo.get()
-        if not display:
-            return ""
-        return self.port_display_to_value.get(display, "")
+        idx = self.port_combo.current()
+        if 0 <= idx < len(self._port_devices):
+            return self._port_devices[idx]
+        return ""
 
     # -------------------------------------------------------------------------
     # Button mapping section
@@ -235,68 +312,133 @@ class App(tk.Tk):
 
         ttk.Label(top_row, text="Number of buttons:").pack(side="left", padx=5)
         spin = ttk.Spinbox(
-            top_row, from_=1, to=32, width=5, textvariable=self.num_buttons,
+            top_row, from_=1, to=MAX_BUTTONS, width=5, textvariable=self.num_buttons,
             command=self._on_num_buttons_changed
         )
         spin.pack(side="left", padx=5)
 
         self.buttons_frame = ttk.Frame(outer_frame)
         self.buttons_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        # Rows are laid out with grid (one column, one row per button);
+        # a single stretchy column replaces per-row pack bookkeeping.
+        self.buttons_frame.columnconfigure(0, weight=1)
 
     def _on_num_buttons_changed(self):
+        # ttk.Spinbox fires on focus/arrow events even when the value
+        # didn't move; don't rebuild, save or re-notify for those.
+        new_count = int(self.num_buttons.get())
+        if new_count == len(self._button_rows):
+            return
+
         self._rebuild_button_rows()
-        self.config_data["num_buttons"] = int(self.num_buttons.get())
-        save_config(self.config_data)
+        self.config_data["num_buttons"] = new_count
+        self._save_config_if_changed()
         self._notify_mappings_changed()
 
     def _rebuild_button_rows(self):
-        for child in self.buttons_frame.winfo_children():
-            child.destroy()
+        """
+        Bring the row widgets in line with the requested button count.
+        Only the difference is touched: growing appends rows (existing
+        selections survive), shrinking destroys rows from the end.
+        """
+        target = int(self.num_buttons.get())
+        rows = self._button_rows
 
-        self.button_file_vars.clear()
+        if len(rows) == target:
+            return
 
-        for i in range(1, int(self.num_buttons.get()) + 1):
-            row = ttk.Frame(self.buttons_frame)
-            row.pack(fill="x", pady=2)
+        # Unmap the container while rows are destroyed/created so Tk does a
+        # single geometry pass at the end instead of relayouting (and
+        # potentially repainting) once per row.
+        self.buttons_frame.pack_forget()
 
-            ttk.Label(row, text=f"Btn {i}:", width=10).pack(side="left", padx=5)
+        while len(rows) > target:
+            row = rows.pop()
+            btn_id = f"BTN{len(rows) + 1}"
+            row.destroy()
+            self.button_file_vars.pop(btn_id, None)
+            self.button_combos.pop(btn_id, None)
+            self._combo_values.pop(btn_id, None)
 
-            var = tk.StringVar(value="")
-            self.button_file_vars[f"BTN{i}"] = var
+        while len(rows) < target:
+            rows.append(self._make_button_row(len(rows) + 1))
 
-            combo = ttk.Combobox(row, textvariable=var, width=40, state="readonly")
-            combo.pack(side="left", padx=5, pady=2, expand=True, fill="x")
-            combo.bind("<Button-1>", lambda e: self._populate_all_combos())
-            combo.bind("<<ComboboxSelected>>", self._on_dropdown_selected)
+        self.buttons_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
-            select_btn = ttk.Button(row, text="Select audio",
-                                    command=lambda btn_id=f"BTN{i}": self._select_audio_for_button(btn_id))
-            select_btn.pack(side="left", padx=5, pady=2)
+        # Fill the new dropdowns once Tk is idle: the rows render first,
+        # and a run of rapid spinbox steps collapses into one populate.
+        if not self._populate_idle_pending:
+            self._populate_idle_pending = True
+            self.after_idle(self._populate_combos_on_idle)
 
+    def _populate_combos_on_idle(self):
+        self._populate_idle_pending = False
         self._populate_all_combos()
 
+    def _make_button_row(self, i):
+        btn_id = f"BTN{i}"
+
+        row = ttk.Frame(self.buttons_frame)
+        row.grid(row=i - 1, column=0, sticky="ew", pady=2)
+
+        ttk.Label(row, text=f"Btn {i}:", width=10).pack(side="left", padx=5)
+
+        var = tk.StringVar(value="")
+        self.button_file_vars[btn_id] = var
+
+        combo = ttk.Combobox(row, textvariable=var, width=40, state="readonly")
+        combo.pack(side="left", padx=5, pady=2, expand=True, fill="x")
+        self.button_combos[btn_id] = combo
+        combo.bind("<Button-1>", self._on_combo_open)
+        combo.bind("<<ComboboxSelected>>", self._on_dropdown_selected)
+
+        select_btn = ttk.Button(row, text="Select audio",
+                                command=functools.partial(self._select_audio_for_button, btn_id))
+        select_btn.pack(side="left", padx=5, pady=2)
+
+        return row
+
     def _populate_all_combos(self):
         files = self._list_audio_files_in_folder()
-        for btn_id, var in self.button_file_vars.items():
-            for row in self.buttons_frame.winfo_children():
-                combo_boxes = [w for w in row.winfo_children() if isinstance(w, ttk.Combobox)]
-                if combo_boxes and combo_boxes[0].cget("textvariable") == str(var):
-                    combo_boxes[0]["values"] = files
+        for btn_id, combo in self.button_combos.items():
+            if self._combo_values.get(btn_id) != files:
+                combo["values"] = files
+                self._combo_values[btn_id] = files
 
     def _list_audio_files_in_folder(self):
         if not self.audio_folder or not os.path.isdir(self.audio_folder):
             return []
 
-        allowed_exts = {".wav", ".mp3", ".ogg", ".flac", ".m4a", ".aac", ".wma"}
+        # Adding/removing a file bumps the directory mtime, so it is a
+        # cheap and reliable invalidation key for the listing.
+        try:
+            folder_mtime = os.path.getmtime(self.audio_folder)
+        except OSError:
+            folder_mtime = None
+
+        cached = self._file_list_cache
+        if (cached is not None and folder_mtime is not None
+                and cached[0] == self.audio_folder and cached[1] == folder_mtime):
+            return cached[2]
+
+        # scandir surfaces the file type from the directory entry itself,
+        # avoiding the extra per-file stat() that listdir + isfile cost.
         files = []
-        for name in os.listdir(self.audio_folder):
-            full_path = os.path.join(self.audio_folder, name)
-            if os.path.isfile(full_path):
-                _, ext = os.path.splitext(name)
-                if ext.lower() in allowed_exts:
-                    files.append(name)
+        try:
+            with os.scandir(self.audio_folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(AUDIO_EXTS):
+                        files.append(entry.name)
+        except OSError:
+            return []
+
+        if folder_mtime is not None:
+            self._file_list_cache = (self.audio_folder, folder_mtime, files)
         return files
 
+    def _on_combo_open(self, event=None):
+        self._populate_all_combos()
+
     def _on_dropdown_selected(self, event=None):
         self._notify_mappings_changed()
 
@@ -325,27 +467,62 @@ class App(tk.Tk):
 
     def _apply_stored_mappings(self):
         stored = self.config_data.get("button_files", {})
+        get_var = self.button_file_vars.get
         for btn_id, value in stored.items():
-            var = self.button_file_vars.get(btn_id)
-            if var is not None and value:
-                var.set(os.path.basename(value))
-
-        self._populate_all_combos()
+            var = get_var(btn_id)
+            if var is None or not value:
+                continue
+            # basename handles configs written before mappings were stored
+            # as bare filenames. Skip the Tcl write if nothing changes.
+            name = os.path.basename(value)
+            if var.get() != name:
+                var.set(name)
 
     def _notify_mappings_changed(self):
         mappings = self.get_button_mappings()
         self.config_data["button_files"] = mappings
-        save_config(self.config_data)
+
+        # config_data is already up to date, so the disk write can be
+        # debounced: spinning the button count from 4 to 12 then collapses
+        # into a single save instead of one per step.
+        self._schedule_config_save()
 
         if self._on_update_mappings:
             self._on_update_mappings(mappings)
 
+    def _schedule_config_save(self):
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+        self._save_after_id = self.after(500, self._flush_config_save)
+
+    def _flush_config_save(self):
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+            self._save_after_id = None
+        self._save_config_if_changed()
+
+    def _save_config_if_changed(self):
+        """Write the config only if it differs from what's on disk."""
+        if self.config_data == self._last_saved_config:
+            return
+        save_config(self.config_data)
+        self._last_saved_config = copy.deepcopy(self.config_data)
+
+    def destroy(self):
+        # Don't lose a debounced save on window close.
+        if self._save_after_id is not None:
+            self._flush_config_save()
+        super().destroy()
+
     def get_button_mappings(self):
+        # Values are already bare filenames: the combos list folder
+        # entries, and both _select_audio_for_button and
+        # _apply_stored_mappings store basenames. No per-call basename.
         mappings = {}
         for btn_id, var in self.button_file_vars.items():
             value = var.get().strip()
             if value:
-                mappings[btn_id] = os.path.basename(value)
+                mappings[btn_id] = value
         return mappings
 
     # -------------------------------------------------------------------------
@@ -373,7 +550,7 @@ class App(tk.Tk):
                 return
 
         self.config_data["last_port"] = port
-        save_config(self.config_data)
+        self._save_config_if_changed()
 
         if self._on_connect and self._on_connect(port, mappings):
             self.connected = True
@@ -392,11 +569,26 @@ class App(tk.Tk):
     # Helper for processing serial messages safely in the GUI thread
     # -------------------------------------------------------------------------
     def handle_serial_message(self, msg):
-        self.after(0, self._process_serial_message, msg)
-
-    def _process_serial_message(self, msg):
-        print(f"[GUI] Received from Arduino: {msg}")
-
-    def _schedule_auto_refresh_files(self):
-        self._populate_all_combos()
-        self.after(2000, self._schedule_auto_refresh_files)
+        # Called from the serial thread. deque.append is thread-safe, so
+        # the line goes straight into the ring buffer; only the first line
+        # of a burst posts a Tk callback, instead of one per line.
+        self._serial_log.append(msg)
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.after(100, self._flush_serial_log)
+
+    def _flush_serial_log(self):
+        self._log_flush_scheduled = False
+
+        # Drain with popleft() rather than list()+clear(): a line the
+        # serial thread appends mid-drain is either popped into this
+        # flush or left in the deque for the flush it just scheduled.
+        msgs = []
+        while True:
+            try:
+                msgs.append(self._serial_log.popleft())
+            except IndexError:
+                break
+
+        if msgs:
+            print("[GUI] Received from Arduino: " + ", ".join(msgs))
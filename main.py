@@ -13,7 +13,13 @@ Entry point of the application.
 import os
 from gui import App
 from serial_listener import SerialListener
-from audio_player import play_audio, stop_all_audio  # stop audio on toggle
+from audio_player import (play_audio, stop_all_audio, invalidate_path_cache,
+                          preload_sounds, STOP_SAME, STOP_ANY)
+
+# Per-press console logging. Each print on the trigger path costs a
+# stdout write (noticeably slow inside a PyInstaller console window);
+# flip this on only when debugging serial traffic.
+VERBOSE = False
 
 
 class Controller:
@@ -24,9 +30,11 @@ class Controller:
     def __init__(self):
         self.serial_listener = None
         self.button_mappings = {}
+        self.resolved_paths = {}       # "BTN1" -> absolute file path
 
         # Playback behavior
-        self.stop_mode = "SAME"        # "SAME" or "ANY"
+        self.stop_mode = "SAME"        # "SAME" or "ANY" (config/GUI string)
+        self.stop_flag = STOP_SAME     # same mode resolved to an int flag
         self.toggle_button_id = ""     # e.g. "BTN10" or "" for disabled
 
         self.app = App(
@@ -38,19 +46,34 @@ class Controller:
         # Pull initial toggle settings from GUI/config
         self._sync_toggle_settings_from_gui()
 
+        self.button_mappings = self.app.config_data.get("button_files", {})
+        self._resolve_mapping_paths()
+
+        # Decode all mapped sounds now, so the first press of each button
+        # doesn't stall on WAV/MP3 decoding.
+        preload_sounds(self.app.audio_folder, self.button_mappings)
+
     # -------------------------------------------------------------------------
     # GUI callbacks
     # -------------------------------------------------------------------------
     def handle_connect(self, port, mappings):
         print(f"[CTRL] Connecting to {port}...")
         self.button_mappings = mappings
+        self._resolve_mapping_paths()
+
+        # Warm the sound cache for whatever is mapped right now, so
+        # buttons remapped since startup don't pay decode latency on
+        # their first press after connecting.
+        preload_sounds(self.app.audio_folder, mappings)
 
         # Also sync toggle settings at connect time
         self._sync_toggle_settings_from_gui()
 
         def on_serial_line(line):
-            self.app.handle_serial_message(line)
+            # Trigger audio before queuing the GUI echo: playback is the
+            # latency-sensitive part, the log line is not.
             self._handle_arduino_message(line)
+            self.app.handle_serial_message(line)
 
         self.serial_listener = SerialListener(port=port, baud_rate=9600, line_callback=on_serial_line)
         ok = self.serial_listener.start()
@@ -67,10 +90,26 @@ class Controller:
     def handle_update_mappings(self, mappings):
         print("[CTRL] Updating mappings.")
         self.button_mappings = mappings
+        self._resolve_mapping_paths()
+
+        # Mappings (or the audio folder) changed, so cached existence checks
+        # may be stale.
+        invalidate_path_cache()
 
         # Also sync toggle settings whenever GUI changes stuff
         self._sync_toggle_settings_from_gui()
 
+    def _resolve_mapping_paths(self):
+        """
+        Resolve each mapping to an absolute path once, so the message
+        handler doesn't run isabs/join per press.
+        """
+        folder = self.app.audio_folder
+        self.resolved_paths = {
+            btn_id: (name if os.path.isabs(name) else os.path.join(folder, name))
+            for btn_id, name in self.button_mappings.items()
+        }
+
     def _sync_toggle_settings_from_gui(self):
         """
         Pull toggle button + stop mode from GUI (if those methods exist).
@@ -81,6 +120,9 @@ class Controller:
         if hasattr(self.app, "get_stop_mode"):
             self.stop_mode = self.app.get_stop_mode()
 
+        # Resolve the string once here so the per-press path compares ints.
+        self.stop_flag = STOP_ANY if self.stop_mode == "ANY" else STOP_SAME
+
     # -------------------------------------------------------------------------
     # Arduino messages
     # -------------------------------------------------------------------------
@@ -90,11 +132,13 @@ class Controller:
             if not msg:
                 return
 
-            print(f"[CTRL] Arduino message: {msg}")
+            if VERBOSE:
+                print(f"[CTRL] Arduino message: {msg}")
 
             # Toggle behavior (if enabled)
             if self.toggle_button_id and msg == self.toggle_button_id:
                 self.stop_mode = "ANY" if self.stop_mode == "SAME" else "SAME"
+                self.stop_flag = STOP_ANY if self.stop_mode == "ANY" else STOP_SAME
                 print(f"[CTRL] Toggled stop mode -> {self.stop_mode}")
                 
                 stop_all_audio()  # stop any ongoing audio when toggling modes
@@ -105,16 +149,11 @@ class Controller:
                     self.app.set_stop_mode(self.stop_mode)
                 return
 
-            if msg in self.button_mappings:
-                mapped = self.button_mappings[msg]
-
-                if os.path.isabs(mapped):
-                    file_path = mapped
-                else:
-                    file_path = os.path.join(self.app.audio_folder, mapped)
-
-                print(f"[CTRL] Playing {msg}: {file_path} (mode={self.stop_mode})")
-                play_audio(msg, file_path, self.stop_mode)
+            file_path = self.resolved_paths.get(msg)
+            if file_path:
+                if VERBOSE:
+                    print(f"[CTRL] Playing {msg}: {file_path} (mode={self.stop_mode})")
+                play_audio(msg, file_path, self.stop_flag)
             else:
                 print(f"[CTRL] No audio mapped for '{msg}'")
 
@@ -7,7 +7,6 @@ Contains a SerialListener class that:
 
 import threading
 import serial
-import time
 
 
 class SerialListener:
@@ -49,28 +48,44 @@ class SerialListener:
     def _run(self):
         """
         Main loop of the listener thread.
-        Reads lines from serial and calls the callback.
+        Reads chunks from serial, splits them into lines and calls the
+        callback once per complete line.
         """
+        buf = bytearray()
+
         while not self._stop_flag.is_set():
             try:
                 if self._serial is None:
                     break
 
-                # Read one line (bytes)
-                line_bytes = self._serial.readline()
-                if line_bytes:
-                    # Decode, strip whitespace/newlines
-                    line = line_bytes.decode(errors="ignore").strip()
-                    if line:
-                        # Call the callback with the received line
-                        self.line_callback(line)
+                # Block for at least one byte (bounded by the port
+                # timeout), then drain everything already buffered by the
+                # driver in the same read instead of going byte-by-byte
+                # through readline().
+                chunk = self._serial.read(max(1, self._serial.in_waiting))
+                if not chunk:
+                    continue
+                buf += chunk
+
+                while True:
+                    nl = buf.find(b"\n")
+                    if nl < 0:
+                        break
+                    # Strip while still bytes: blank/CR-only lines are
+                    # discarded without ever constructing a str.
+                    line_bytes = bytes(buf[:nl]).strip()
+                    del buf[:nl + 1]
+                    if line_bytes:
+                        self.line_callback(line_bytes.decode(errors="ignore"))
+
+                # A line should be a handful of bytes ("BTN12"); if no
+                # newline shows up for this long the stream is garbage.
+                if len(buf) > 4096:
+                    buf.clear()
             except Exception as e:
                 print(f"[ERROR] Serial reading error: {e}")
                 break
 
-            # Small sleep to avoid tight loop
-            time.sleep(0.01)
-
         print("[INFO] Serial listener thread stopped.")
 
     def stop(self):